@@ -86,6 +86,9 @@ server {
     # API endpoints
     location /api/ {
         proxy_pass http://localhost:8000/api/;
+        # Pass streamed chat (SSE) frames through as they are produced
+        proxy_http_version 1.1;
+        proxy_buffering off;
         proxy_set_header Host $host;
         proxy_set_header X-Real-IP $remote_addr;
         proxy_set_header X-Forwarded-For $proxy_add_x_forwarded_for;
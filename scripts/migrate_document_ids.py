@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Document id migration for AI Ethics Assistant
+Deletes chunks stored under the pre-BLAKE2b (truncated SHA-256) document ids
+
+Usage:
+    uv run --env-file=.env python scripts/migrate_document_ids.py
+
+Run once after upgrading a collection ingested before the switch. Ingestion
+only replaces chunks under the current ids, so without this the old chunks
+stay alongside the re-ingested ones.
+"""
+
+import asyncio
+import hashlib
+import logging
+import sys
+
+from ai_ethics_assistant.configuration import get_config
+from ai_ethics_assistant.services.s3_service import S3Service
+from ai_ethics_assistant.services.vector_store_service import VectorStoreService
+
+# Filter deletes in flight at once
+DELETE_CONCURRENCY = 16
+
+
+def legacy_document_id(pdf_key: str, pdf_prefix: str) -> str:
+    """Document ID as generated before the switch to BLAKE2b"""
+    cleaned_name = pdf_key.replace(pdf_prefix, "")
+    return hashlib.sha256(cleaned_name.encode()).hexdigest()[:16]
+
+
+async def main() -> int:
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        handlers=[logging.StreamHandler(sys.stdout)],
+    )
+    logger = logging.getLogger(__name__)
+
+    config = get_config()
+    s3_service = S3Service(config.s3)
+    vector_store_service = VectorStoreService(config.vector_db)
+    try:
+        pdf_keys = await s3_service.list_pdfs()
+        logger.info(f"Removing legacy chunks of {len(pdf_keys)} PDFs")
+
+        slots = asyncio.Semaphore(DELETE_CONCURRENCY)
+
+        async def delete_legacy(pdf_key: str) -> int:
+            async with slots:
+                return await vector_store_service.delete_by_filter(
+                    {"document_id": legacy_document_id(pdf_key, config.s3.pdf_prefix)}
+                )
+
+        deleted = await asyncio.gather(*[delete_legacy(key) for key in pdf_keys])
+        logger.info(f"Deleted ~{sum(deleted)} legacy chunks")
+        return 0
+
+    except Exception as e:
+        logger.error(f"Migration failed: {e}", exc_info=True)
+        return 1
+    finally:
+        await vector_store_service.close()
+        await s3_service.close()
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
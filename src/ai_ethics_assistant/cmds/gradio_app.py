@@ -4,134 +4,167 @@ Gradio UI for AI Ethics Assistant
 Provides a user-friendly chat interface for testing the RAG system
 """
 
-import json
+import atexit
 import logging
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator
 
 import gradio as gr
 import httpx
+import orjson
 
-from ai_ethics_assistant.configuration import Config
+from ai_ethics_assistant.configuration import get_config
 
 logger = logging.getLogger(__name__)
 
+# Minimum time between chat re-renders while streaming, so Gradio can
+# coalesce many small token updates into one DOM update
+STREAM_UPDATE_INTERVAL = 0.05
+
+
+def _iter_sse_events(response: httpx.Response) -> Iterator[dict]:
+    """Yield decoded `data:` payloads from an SSE response, staying in bytes"""
+    pending = b""
+    for data in response.iter_bytes():
+        pending += data
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            if not line.startswith(b"data: "):
+                continue
+            try:
+                yield orjson.loads(line[6:])
+            except orjson.JSONDecodeError:
+                continue
+
 
 class GradioRAGInterface:
     """Gradio interface for the AI Ethics Assistant RAG system"""
 
     def __init__(self, api_base_url: str = "http://localhost:8000"):
         self.api_base_url = api_base_url
+        # One pooled client for the whole UI so chat turns and status checks
+        # reuse connections instead of paying TCP/TLS setup on every click
+        self._client = httpx.Client(
+            base_url=api_base_url,
+            http2=True,
+            timeout=httpx.Timeout(60.0, connect=5.0),
+            limits=httpx.Limits(max_keepalive_connections=8, max_connections=16),
+        )
+
+    def close(self) -> None:
+        """Close the pooled HTTP client"""
+        self._client.close()
 
     def create_interface(self) -> gr.Blocks:
         """Create the Gradio interface"""
 
         def sync_chat_wrapper(message, history, stream_enabled, top_k):
             """Synchronous wrapper for async chat function"""
-            # Use sync HTTP client instead of async to avoid event loop issues
-            import httpx
-
             if not message.strip():
-                return "", history
+                yield "", history
+                return
 
-            new_history = history + [[message, ""]]
+            new_history = history + [
+                {"role": "user", "content": message},
+                {"role": "assistant", "content": ""},
+            ]
+            answer = new_history[-1]
 
             try:
-                with httpx.Client(timeout=60.0) as client:
-                    if stream_enabled:
-                        # Use streaming with sync client
-                        with client.stream(
-                            "POST",
-                            f"{self.api_base_url}/api/v1/chat",
-                            json={"query": message, "stream": True, "top_k": top_k},
-                        ) as response:
-                            if response.status_code == 200:
-                                response_text = ""
-                                for line in response.iter_lines():
-                                    if line.startswith("data: "):
-                                        try:
-                                            data = json.loads(line[6:])
-                                            if data.get("type") == "chunk":
-                                                response_text += data.get("content", "")
-                                            elif data.get("type") == "end":
-                                                break
-                                        except json.JSONDecodeError:
-                                            continue
-                                new_history[-1][1] = response_text
-                            else:
-                                new_history[-1][1] = (
-                                    f"API Error: {response.status_code}"
-                                )
-                    else:
-                        # Non-streaming request
-                        response = client.post(
-                            f"{self.api_base_url}/api/v1/chat",
-                            json={"query": message, "stream": False, "top_k": top_k},
-                        )
+                if stream_enabled:
+                    # Use streaming with sync client
+                    with self._client.stream(
+                        "POST",
+                        "/api/v1/chat",
+                        json={"query": message, "stream": True, "top_k": top_k},
+                        headers={"Accept": "text/event-stream"},
+                    ) as response:
                         if response.status_code == 200:
-                            result = response.json()
-                            new_history[-1][1] = result.get(
-                                "answer", "No response received"
-                            )
+                            response_text = ""
+                            last_update = time.monotonic()
+                            for data in _iter_sse_events(response):
+                                if data.get("type") == "chunk":
+                                    response_text += data.get("content", "")
+                                    now = time.monotonic()
+                                    if now - last_update >= STREAM_UPDATE_INTERVAL:
+                                        last_update = now
+                                        answer["content"] = response_text
+                                        yield "", new_history
+                                elif data.get("type") == "end":
+                                    break
+                            answer["content"] = response_text
                         else:
-                            new_history[-1][1] = f"API Error: {response.status_code}"
+                            answer["content"] = f"API Error: {response.status_code}"
+                else:
+                    # Non-streaming request
+                    response = self._client.post(
+                        "/api/v1/chat",
+                        json={"query": message, "stream": False, "top_k": top_k},
+                    )
+                    if response.status_code == 200:
+                        result = response.json()
+                        answer["content"] = result.get("answer", "No response received")
+                    else:
+                        answer["content"] = f"API Error: {response.status_code}"
             except Exception as e:
-                new_history[-1][1] = f"Connection Error: {str(e)}"
+                answer["content"] = f"Connection Error: {str(e)}"
 
-            return "", new_history
+            yield "", new_history
 
         def sync_health_check():
             """Synchronous wrapper for health check"""
-            import httpx
-
             try:
-                with httpx.Client(timeout=10.0) as client:
-                    response = client.get(f"{self.api_base_url}/api/v1/rag/health")
-                    if response.status_code == 200:
-                        health_data = response.json()
-                        overall_status = health_data.get("overall", "unknown")
-
-                        if overall_status == "healthy":
-                            return "✅ RAG System: All components healthy"
-                        elif overall_status == "degraded":
-                            return "⚠️ RAG System: Some components unhealthy"
-                        else:
-                            error = health_data.get("error", "Unknown error")
-                            return f"❌ RAG System: Unhealthy - {error}"
+                response = self._client.get("/api/v1/rag/health", timeout=10.0)
+                if response.status_code == 200:
+                    health_data = response.json()
+                    overall_status = health_data.get("overall", "unknown")
+
+                    if overall_status == "healthy":
+                        return "✅ RAG System: All components healthy"
+                    elif overall_status == "degraded":
+                        return "⚠️ RAG System: Some components unhealthy"
                     else:
-                        return f"❌ API Connection: Error {response.status_code}"
+                        error = health_data.get("error", "Unknown error")
+                        return f"❌ RAG System: Unhealthy - {error}"
+                else:
+                    return f"❌ API Connection: Error {response.status_code}"
             except Exception as e:
                 return f"❌ API Connection: Failed to connect - {str(e)}"
 
         def sync_status_check():
             """Synchronous wrapper for status check"""
-            import httpx
-
             try:
-                with httpx.Client(timeout=10.0) as client:
-                    response = client.get(f"{self.api_base_url}/api/v1/status")
-                    if response.status_code == 200:
-                        status_data = response.json()
-                        services = status_data.get("services", {})
-                        dev_mode = status_data.get("dev_mode", False)
-
-                        status_text = (
-                            f"System Status: {status_data.get('status', 'unknown')}\n"
-                        )
-                        status_text += (
-                            f"Development Mode: {'Yes' if dev_mode else 'No'}\n"
-                        )
-                        status_text += f"API: {services.get('api', 'unknown')}\n"
-                        status_text += (
-                            f"Vector DB: {services.get('vector_db', 'unknown')}\n"
-                        )
-                        status_text += f"LLM: {services.get('llm', 'unknown')}"
+                response = self._client.get("/api/v1/status", timeout=10.0)
+                if response.status_code == 200:
+                    status_data = response.json()
+                    services = status_data.get("services", {})
+                    dev_mode = status_data.get("dev_mode", False)
+
+                    status_text = (
+                        f"System Status: {status_data.get('status', 'unknown')}\n"
+                    )
+                    status_text += f"Development Mode: {'Yes' if dev_mode else 'No'}\n"
+                    status_text += f"API: {services.get('api', 'unknown')}\n"
+                    status_text += (
+                        f"Vector DB: {services.get('vector_db', 'unknown')}\n"
+                    )
+                    status_text += f"LLM: {services.get('llm', 'unknown')}"
 
-                        return status_text
-                    else:
-                        return f"Failed to get status: {response.status_code}"
+                    return status_text
+                else:
+                    return f"Failed to get status: {response.status_code}"
             except Exception as e:
                 return f"Failed to connect: {str(e)}"
 
+        def sync_bootstrap():
+            """Run the health and status checks concurrently for the initial render"""
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                health = executor.submit(sync_health_check)
+                status = executor.submit(sync_status_check)
+                return health.result(), status.result()
+
         with gr.Blocks(
             title="AI Ethics Assistant",
             theme="soft",
@@ -146,6 +179,8 @@ class GradioRAGInterface:
                     with gr.Column(scale=4):
                         chatbot = gr.Chatbot(
                             height=500,
+                            type="messages",
+                            render_markdown=True,
                             placeholder="Hi! I'm your AI Ethics Assistant. Ask me about AI policy, ethics, governance, or regulations.",
                             show_label=False,
                         )
@@ -188,7 +223,9 @@ class GradioRAGInterface:
 
                 # Handle message submission
                 def submit_message(message, history, stream_enabled, top_k):
-                    return sync_chat_wrapper(message, history, stream_enabled, top_k)
+                    yield from sync_chat_wrapper(
+                        message, history, stream_enabled, top_k
+                    )
 
                 msg.submit(
                     submit_message,
@@ -225,9 +262,8 @@ class GradioRAGInterface:
 
                 status_btn.click(sync_status_check, outputs=status_output)
 
-                # Auto-load status on tab load
-                interface.load(sync_health_check, outputs=health_output)
-                interface.load(sync_status_check, outputs=status_output)
+                # Auto-load health and status on page load in one event
+                interface.load(sync_bootstrap, outputs=[health_output, status_output])
 
             gr.Markdown("""
             ### About
@@ -248,7 +284,7 @@ def main():
         handlers=[logging.StreamHandler(sys.stdout)],
     )
 
-    config = Config()
+    config = get_config()
     # Use BACKEND_URL env var if set (for Docker), otherwise localhost
     api_url = os.environ.get("BACKEND_URL", "http://localhost:8000")
 
@@ -258,17 +294,17 @@ def main():
     logger.info(f"Connecting to API at: {api_url}")
 
     rag_interface = GradioRAGInterface(api_base_url=api_url)
+    atexit.register(rag_interface.close)
 
     # Check API connectivity
-    with httpx.Client(timeout=10.0) as client:
-        try:
-            response = client.get(f"{api_url}/api/v1/rag/health")
-            if response.status_code == 200:
-                logger.info("API Health Check: Successfully connected")
-            else:
-                logger.warning(f"API Health Check: Status {response.status_code}")
-        except Exception as e:
-            logger.warning(f"API Health Check: Failed to connect - {e}")
+    try:
+        response = rag_interface._client.get("/api/v1/rag/health", timeout=10.0)
+        if response.status_code == 200:
+            logger.info("API Health Check: Successfully connected")
+        else:
+            logger.warning(f"API Health Check: Status {response.status_code}")
+    except Exception as e:
+        logger.warning(f"API Health Check: Failed to connect - {e}")
 
     # Create and launch interface
     interface = rag_interface.create_interface()
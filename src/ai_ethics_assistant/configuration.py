@@ -1,4 +1,5 @@
-from typing import Optional
+import functools
+from typing import Literal, Optional
 
 from pydantic import Field, SecretStr
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -7,7 +8,15 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 class VectorDBConfig(BaseSettings):
     host: str = "localhost"
     port: int = 6333
+    grpc_port: int = 6334
+    prefer_grpc: bool = True
     collection_name: str = "ai_ethics_docs"
+    upsert_batch_size: int = 32
+    upsert_concurrency: int = 2
+    # Shortlist size, relative to the limit, rescored at full precision
+    search_oversampling: float = 2.0
+    # Seconds a successful connection test is trusted for
+    health_check_ttl: float = 30.0
 
 
 class LLMConfig(BaseSettings):
@@ -18,6 +27,10 @@ class LLMConfig(BaseSettings):
     timeout: int = 30
     max_retries: int = 3
     streaming: bool = True
+    # Recent query reformulations kept in memory
+    reformulation_cache_size: int = 1024
+    # Seconds a successful connection test is trusted for
+    health_check_ttl: float = 30.0
 
 
 class S3Config(BaseSettings):
@@ -26,11 +39,24 @@ class S3Config(BaseSettings):
     access_key_id: SecretStr
     secret_access_key: SecretStr
     pdf_prefix: str = ""
+    # Ranged-GET download tuning for objects larger than one part
+    part_size: int = 8 * 1024 * 1024
+    max_concurrency: int = 8
+    # PDFs downloaded ahead of (and concurrently with) parsing
+    download_concurrency: int = 16
+    # Seconds a bucket listing is reused for
+    list_cache_ttl: float = 60.0
+    # Connections kept open by the shared S3 client
+    max_pool_connections: int = 64
 
 
 class EmbeddingConfig(BaseSettings):
     model_name: str = "sentence-transformers/all-MiniLM-L6-v2"
     batch_size: int = 32
+    # SQLite file for reusing chunk embeddings across ingestion runs
+    cache_path: str | None = None
+    # Number of query embeddings kept in memory by the API
+    query_cache_size: int = 4096
 
 
 class Config(BaseSettings):
@@ -57,7 +83,26 @@ class Config(BaseSettings):
     # Document processing settings
     chunk_size: int = 1000
     chunk_overlap: int = 200
-
-
+    # Docling worker processes, recycled after this many conversions each
+    docling_workers: int = 2
+    docling_max_tasks_per_child: int = 50
+    # Pages converted per Docling call, bounding memory per document
+    docling_pages_per_task: int = 4
+    # pypdfium2 is leaner for text PDFs; docling_parse for OCR/GPU setups
+    pdf_backend: Literal["pypdfium2", "docling_parse"] = "pypdfium2"
+
+    # Ingestion settings
+    ingest_concurrency: int = 2
+
+    # Retrieval results reused for near-duplicate queries (0 disables)
+    semantic_cache_size: int = 1024
+    semantic_cache_threshold: float = 0.95
+    # Seconds before a cached retrieval expires, bounding staleness after
+    # a re-ingest
+    semantic_cache_ttl: float = 300.0
+
+
+@functools.lru_cache(maxsize=1)
 def get_config() -> Config:
+    """Load configuration from the environment once per process"""
     return Config()
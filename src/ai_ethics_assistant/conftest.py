@@ -0,0 +1,7 @@
+import pytest
+
+
+@pytest.fixture
+def anyio_backend():
+    # The services are written against asyncio (to_thread, TaskGroup, uvloop)
+    return "asyncio"
@@ -1,23 +1,85 @@
-from dataclasses import dataclass
+from functools import cached_property
+from typing import TYPE_CHECKING
 
 from fastapi import Request
 
 from ai_ethics_assistant.configuration import Config
-from ai_ethics_assistant.pipeline.embedder import HuggingFaceEmbedder
 from ai_ethics_assistant.services.llm_service import LLMService
-from ai_ethics_assistant.services.rag_service import RAGService
 from ai_ethics_assistant.services.s3_service import S3Service
 from ai_ethics_assistant.services.vector_store_service import VectorStoreService
 
+if TYPE_CHECKING:
+    from ai_ethics_assistant.pipeline.embedder import (
+        CachedEmbedder,
+        HuggingFaceEmbedder,
+    )
+    from ai_ethics_assistant.services.rag_service import RAGService
+    from ai_ethics_assistant.services.semantic_cache import SemanticCache
+
 
-@dataclass
 class Dependencies:
-    config: Config
-    s3_service: S3Service
-    vector_store_service: VectorStoreService
-    embedder: HuggingFaceEmbedder
-    llm_service: LLMService
-    rag_service: RAGService
+    """Application services, each constructed on first access
+
+    The embedder pulls in torch and sentence-transformers, so it (and the
+    RAG service built on it) is imported lazily to keep processes that never
+    touch it light.
+    """
+
+    def __init__(self, config: Config):
+        self.config = config
+
+    @cached_property
+    def s3_service(self) -> S3Service:
+        return S3Service(self.config.s3)
+
+    @cached_property
+    def vector_store_service(self) -> VectorStoreService:
+        return VectorStoreService(self.config.vector_db)
+
+    @cached_property
+    def embedder(self) -> "HuggingFaceEmbedder":
+        from ai_ethics_assistant.pipeline.embedder import HuggingFaceEmbedder
+
+        return HuggingFaceEmbedder(
+            self.config.embedding.model_name,
+            batch_size=self.config.embedding.batch_size,
+        )
+
+    @cached_property
+    def query_embedder(self) -> "CachedEmbedder":
+        from ai_ethics_assistant.pipeline.embedder import CachedEmbedder
+
+        return CachedEmbedder(
+            self.embedder, maxsize=self.config.embedding.query_cache_size
+        )
+
+    @cached_property
+    def llm_service(self) -> LLMService:
+        return LLMService(self.config.llm)
+
+    @cached_property
+    def semantic_cache(self) -> "SemanticCache | None":
+        from ai_ethics_assistant.services.semantic_cache import SemanticCache
+
+        if self.config.semantic_cache_size <= 0:
+            return None
+        return SemanticCache(
+            self.embedder.get_embedding_dimension(),
+            maxsize=self.config.semantic_cache_size,
+            threshold=self.config.semantic_cache_threshold,
+            ttl=self.config.semantic_cache_ttl,
+        )
+
+    @cached_property
+    def rag_service(self) -> "RAGService":
+        from ai_ethics_assistant.services.rag_service import RAGService
+
+        return RAGService(
+            self.llm_service,
+            self.query_embedder,
+            self.vector_store_service,
+            semantic_cache=self.semantic_cache,
+        )
 
 
 def get_config(request: Request) -> Config:
@@ -38,7 +100,7 @@ def get_vector_store_service(request: Request) -> VectorStoreService:
     return state.vector_store_service
 
 
-def get_embedder(request: Request) -> HuggingFaceEmbedder:
+def get_embedder(request: Request) -> "HuggingFaceEmbedder":
     """Get embedder from application state."""
     state: Dependencies = request.app.state.dependencies
     return state.embedder
@@ -50,7 +112,7 @@ def get_llm_service(request: Request) -> LLMService:
     return state.llm_service
 
 
-def get_rag_service(request: Request) -> RAGService:
+def get_rag_service(request: Request) -> "RAGService":
     """Get RAG service from application state."""
     state: Dependencies = request.app.state.dependencies
     return state.rag_service
@@ -1,40 +1,89 @@
+import asyncio
+import hashlib
 import logging
+import os
+import re
 from abc import ABC, abstractmethod
+from bisect import bisect_right
+from collections import OrderedDict
+from collections.abc import Mapping
+from types import MappingProxyType
 
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_huggingface import HuggingFaceEmbeddings
+import numpy as np
+import torch
+from sentence_transformers import SentenceTransformer
+from transformers import AutoTokenizer
 
 logger = logging.getLogger(__name__)
 
+# Chunk boundaries in order of preference: paragraph, line, sentence, word
+_SEP_RE = re.compile(r"\n\n|\n|\. | ")
+_SEP_RANK = {"\n\n": 0, "\n": 1, ". ": 2, " ": 3}
+
+# Output dimension of models we ship with, so startup never has to probe
+_DIM_TABLE = {
+    "sentence-transformers/all-MiniLM-L6-v2": 384,
+    "sentence-transformers/all-MiniLM-L12-v2": 384,
+    "sentence-transformers/all-mpnet-base-v2": 768,
+    "BAAI/bge-small-en-v1.5": 384,
+    "BAAI/bge-base-en-v1.5": 768,
+}
+
+# Read-only metadata shared by every chunk created without any
+_EMPTY_METADATA: Mapping = MappingProxyType({})
+
 
 class EmbedderError(Exception):
     pass
 
 
+def known_embedding_dimension(model_name: str) -> int | None:
+    """Output dimension of a model we ship with, without loading it"""
+    return _DIM_TABLE.get(model_name)
+
+
+class Chunk:
+    """A piece of chunked text; slotted because corpora produce millions"""
+
+    __slots__ = ("text", "chunk_id", "metadata")
+
+    def __init__(self, text: str, chunk_id: int, metadata: Mapping):
+        self.text = text
+        self.chunk_id = chunk_id
+        self.metadata = metadata
+
+    def __getitem__(self, key: str):
+        # Keep chunk["text"]-style access working for existing callers
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+
 class Embedder(ABC):
     """Abstract base class for embedding generators"""
 
     @abstractmethod
-    async def embed_text(self, text: str) -> list[float]:
+    async def embed_text(self, text: str) -> np.ndarray:
         """Generate embedding for a single text
 
         Args:
             text: Text to embed
 
         Returns:
-            Embedding vector
+            Embedding vector of shape (dimension,)
         """
         pass
 
     @abstractmethod
-    async def embed_batch(self, texts: list[str]) -> list[list[float]]:
+    async def embed_batch(self, texts: list[str]) -> np.ndarray:
         """Generate embeddings for multiple texts
 
         Args:
             texts: List of texts to embed
 
         Returns:
-            List of embedding vectors
+            Array of shape (len(texts), dimension), one row per text
         """
         pass
 
@@ -45,13 +94,36 @@ class Embedder(ABC):
 
 
 class HuggingFaceEmbedder(Embedder):
-    """Hugging Face sentence-transformers implementation using LangChain"""
+    """Hugging Face sentence-transformers implementation"""
 
-    def __init__(self, model_name: str):
+    def __init__(self, model_name: str, batch_size: int = 32):
         try:
-            self.embeddings = HuggingFaceEmbeddings(model_name=model_name)
-            # Get dimension by embedding a test string
-            self.dimension = len(self.embeddings.embed_query("test"))
+            self.model_name = model_name
+            self.batch_size = batch_size
+            # Vectors are only shipped to Qdrant, which quantizes them server
+            # side anyway, so half precision is plenty for the batch path
+            self.dtype = np.float16
+            # Let the Rust tokenizer use all cores; tokenization otherwise
+            # dominates CPU time when the model itself runs on a GPU
+            os.environ.setdefault("TOKENIZERS_PARALLELISM", "true")
+            self.model = SentenceTransformer(model_name)
+            if not getattr(self.model.tokenizer, "is_fast", False):
+                self.model.tokenizer = AutoTokenizer.from_pretrained(
+                    model_name, use_fast=True
+                )
+            if self.model.device.type == "cuda":
+                # Half-precision weights roughly double GPU encode throughput
+                self.model.half()
+            self.dimension = (
+                _DIM_TABLE.get(model_name)
+                or self.model.get_sentence_embedding_dimension()
+                or 0
+            )
+            # The model lives on a single device, so only one encode runs at a
+            # time; concurrent sub-batches would just contend for it. Extra
+            # GPUs are used by running one ingestion worker per GPU instead
+            self._device_lock = asyncio.Lock()
+            self._warm_up()
             logger.info(f"Initialized HuggingFace embedder with model '{model_name}'")
             logger.info(f"Embedding dimension: {self.dimension}")
         except Exception as e:
@@ -59,31 +131,105 @@ class HuggingFaceEmbedder(Embedder):
                 f"Failed to initialize embedder with model '{model_name}': {e}"
             )
 
-    async def embed_text(self, text: str) -> list[float]:
+    def _warm_up(self) -> None:
+        """Run one full-size batch so the first real request skips lazy init"""
+        with torch.inference_mode():
+            self.model.encode(
+                [" "] * self.batch_size,
+                batch_size=self.batch_size,
+                convert_to_numpy=True,
+                show_progress_bar=False,
+            )
+
+    async def embed_text(self, text: str) -> np.ndarray:
         """Generate embedding for a single text"""
         try:
-            return self.embeddings.embed_query(text)
+            vectors = await self._encode([text])
+            return vectors[0]
         except Exception as e:
             raise EmbedderError(f"Failed to embed text: {e}")
 
-    async def embed_batch(self, texts: list[str]) -> list[list[float]]:
+    async def embed_batch(self, texts: list[str]) -> np.ndarray:
         """Generate embeddings for multiple texts efficiently"""
         try:
             if not texts:
-                return []
+                return np.empty((0, self.dimension), dtype=self.dtype)
 
             logger.info(f"Embedding batch of {len(texts)} texts")
-            embeddings = self.embeddings.embed_documents(texts)
+            # Group texts of similar length into the same sub-batch so little
+            # compute is spent on padding, then restore the caller's order
+            order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+            sub_batches = [
+                [texts[i] for i in order[start : start + self.batch_size]]
+                for start in range(0, len(texts), self.batch_size)
+            ]
+            results = await asyncio.gather(*[self._encode(b) for b in sub_batches])
+            embeddings = np.empty((len(texts), self.dimension), dtype=self.dtype)
+            embeddings[order] = np.concatenate(results)
             logger.info(f"Successfully embedded {len(texts)} texts")
             return embeddings
 
         except Exception as e:
             raise EmbedderError(f"Failed to embed batch: {e}")
 
+    async def _encode(self, texts: list[str]) -> np.ndarray:
+        """Encode texts off the event loop"""
+        async with self._device_lock:
+            return await asyncio.to_thread(self._encode_sync, texts)
+
+    def _encode_sync(self, texts: list[str]) -> np.ndarray:
+        # inference_mode is thread-local, so it is entered on the worker thread
+        with torch.inference_mode():
+            return self.model.encode(
+                texts,
+                batch_size=self.batch_size,
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+                show_progress_bar=False,
+            )
+
     def get_embedding_dimension(self) -> int:
         return self.dimension
 
 
+class CachedEmbedder(Embedder):
+    """Embedder wrapper that keeps recent single-text embeddings in an LRU
+
+    Popular or repeated queries then skip the model forward pass entirely.
+    """
+
+    def __init__(self, embedder: HuggingFaceEmbedder, maxsize: int = 4096):
+        self.embedder = embedder
+        self.model_name = embedder.model_name
+        self.maxsize = maxsize
+        # Keyed by digest rather than raw text to bound per-entry memory
+        self._cache: OrderedDict[bytes, np.ndarray] = OrderedDict()
+
+        logger.info(f"Initialized query embedding cache (maxsize={maxsize})")
+
+    async def embed_text(self, text: str) -> np.ndarray:
+        """Return the cached embedding for text, computing it on a miss"""
+        key = hashlib.sha256(f"{self.model_name}\0{text}".encode()).digest()
+        vector = self._cache.get(key)
+        if vector is not None:
+            self._cache.move_to_end(key)
+            return vector
+
+        vector = await self.embedder.embed_text(text)
+        # Shared between callers, so make accidental in-place edits fail loudly
+        vector.flags.writeable = False
+        self._cache[key] = vector
+        if len(self._cache) > self.maxsize:
+            self._cache.popitem(last=False)
+        return vector
+
+    async def embed_batch(self, texts: list[str]) -> np.ndarray:
+        return await self.embedder.embed_batch(texts)
+
+    def get_embedding_dimension(self) -> int:
+        return self.embedder.get_embedding_dimension()
+
+
 class TextChunker:
     """Utility for chunking text into optimal sizes for embedding"""
 
@@ -92,52 +238,105 @@ class TextChunker:
 
         Args:
             chunk_size: Maximum characters per chunk
-            chunk_overlap: Character overlap between chunks
+            chunk_overlap: Character overlap between chunks, smaller than
+                chunk_size
         """
+        if chunk_size <= 0:
+            raise ValueError(f"chunk_size must be positive, got {chunk_size}")
+        if not 0 <= chunk_overlap < chunk_size:
+            raise ValueError(
+                f"chunk_overlap ({chunk_overlap}) must be at least 0 and smaller "
+                f"than chunk_size ({chunk_size})"
+            )
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
 
-        # RecursiveCharacterTextSplitter maintains sentence boundaries
-        self.splitter = RecursiveCharacterTextSplitter(
-            chunk_size=chunk_size,
-            chunk_overlap=chunk_overlap,
-            separators=["\n\n", "\n", ". ", " ", ""],
-            length_function=len,
-        )
-
         logger.info(
             f"Initialized text chunker (size={chunk_size}, overlap={chunk_overlap})"
         )
 
-    def chunk_text(self, text: str, metadata: dict | None = None) -> list[dict]:
+    def chunk_text(
+        self, text: str, metadata: Mapping | None = None, start_id: int = 0
+    ) -> list[Chunk]:
         """Split text into chunks with metadata
 
         Args:
             text: Text to chunk
-            metadata: Optional metadata to attach to each chunk
+            metadata: Optional metadata to attach to each chunk. The same
+                mapping is shared by every chunk, so callers must not mutate it.
+            start_id: chunk_id of the first chunk, for numbering a document
+                that is chunked in several pieces
 
         Returns:
-            List of chunks with format:
-                {
-                    "text": str,
-                    "chunk_id": int,
-                    "metadata": dict
-                }
+            List of Chunk objects with text, chunk_id and metadata attributes
         """
         try:
-            chunks = self.splitter.split_text(text)
-
-            result = []
-            for i, chunk_text in enumerate(chunks):
-                chunk_data = {
-                    "text": chunk_text,
-                    "chunk_id": i,
-                    "metadata": metadata or {},
-                }
-                result.append(chunk_data)
-
-            logger.info(f"Split text into {len(chunks)} chunks")
+            chunks = self._split(text)
+
+            shared_metadata = metadata if metadata is not None else _EMPTY_METADATA
+            result = [
+                Chunk(chunk_text, i, shared_metadata)
+                for i, chunk_text in enumerate(chunks, start_id)
+            ]
+
+            logger.debug(f"Split text into {len(chunks)} chunks")
             return result
 
         except Exception as e:
             raise EmbedderError(f"Failed to chunk text: {e}")
+
+    def _split(self, text: str) -> list[str]:
+        """Greedily pack text into windows that end on the best nearby boundary"""
+        # One regex pass collects every candidate break; windows are then
+        # placed with index arithmetic instead of rescanning the text
+        breaks = []
+        ranks = []
+        for match in _SEP_RE.finditer(text):
+            breaks.append(match.end())
+            ranks.append(_SEP_RANK[match.group()])
+
+        chunks = []
+        start = 0
+        length = len(text)
+        while start < length:
+            limit = start + self.chunk_size
+            if limit >= length:
+                end = length
+            else:
+                end = self._best_break(breaks, ranks, start, limit)
+
+            chunk = text[start:end].strip()
+            if chunk:
+                chunks.append(chunk)
+            if end >= length:
+                break
+
+            # Start the next window `chunk_overlap` chars back, snapped forward
+            # to the next word boundary (at the latest the end of this chunk,
+            # i.e. no overlap) so chunks don't open mid-word. Only a hard cut
+            # through a word longer than the window leaves no boundary to use
+            next_start = max(end - self.chunk_overlap, start + 1)
+            i = bisect_right(breaks, next_start - 1)
+            if i < len(breaks) and breaks[i] <= end:
+                next_start = breaks[i]
+            start = next_start
+
+        return chunks
+
+    def _best_break(
+        self, breaks: list[int], ranks: list[int], start: int, limit: int
+    ) -> int:
+        """Pick the highest-priority break in the back half of the window"""
+        hi = bisect_right(breaks, limit)
+        lo = bisect_right(breaks, start + self.chunk_size // 2)
+        if lo >= hi:
+            # No boundary in the back half, take the last one in the window
+            lo = bisect_right(breaks, start)
+        if lo >= hi:
+            return limit
+
+        best = hi - 1
+        for i in range(hi - 2, lo - 1, -1):
+            if ranks[i] < ranks[best]:
+                best = i
+        return breaks[best]
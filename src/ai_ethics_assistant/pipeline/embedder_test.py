@@ -0,0 +1,68 @@
+import pytest
+
+from ai_ethics_assistant.pipeline.embedder import TextChunker
+
+
+def _texts(chunker: TextChunker, text: str) -> list[str]:
+    return [chunk.text for chunk in chunker.chunk_text(text)]
+
+
+@pytest.mark.parametrize("size, overlap", [(10, 10), (10, 11), (10, -1), (0, 0)])
+def test_rejects_invalid_sizes(size, overlap):
+    with pytest.raises(ValueError):
+        TextChunker(chunk_size=size, chunk_overlap=overlap)
+
+
+@pytest.mark.parametrize("text", ["", "   ", "\n\n\n"])
+def test_blank_text_has_no_chunks(text):
+    assert TextChunker(chunk_size=10, chunk_overlap=3).chunk_text(text) == []
+
+
+def test_short_text_is_one_chunk():
+    chunks = TextChunker(chunk_size=100, chunk_overlap=10).chunk_text(
+        "hello world", metadata={"source": "a.pdf"}, start_id=5
+    )
+
+    assert len(chunks) == 1
+    assert chunks[0].text == "hello world"
+    assert chunks[0].chunk_id == 5
+    assert chunks[0].metadata["source"] == "a.pdf"
+
+
+def test_chunks_respect_size_and_start_on_word_boundaries():
+    text = "hello world this is a test of the chunker"
+    texts = _texts(TextChunker(chunk_size=10, chunk_overlap=3), text)
+
+    assert texts == ["hello", "world", "this is a", "a test of", "of the", "chunker"]
+
+
+def test_overlap_repeats_trailing_words():
+    text = "alpha beta gamma delta epsilon zeta eta theta"
+    texts = _texts(TextChunker(chunk_size=20, chunk_overlap=8), text)
+
+    assert len(texts) > 1
+    for prev, nxt in zip(texts, texts[1:]):
+        assert prev.split()[-1] == nxt.split()[0]
+
+
+def test_prefers_paragraph_breaks():
+    text = "first paragraph here\n\nsecond one"
+    texts = _texts(TextChunker(chunk_size=25, chunk_overlap=5), text)
+
+    assert texts[0] == "first paragraph here"
+
+
+def test_word_longer_than_window_is_hard_cut():
+    texts = _texts(TextChunker(chunk_size=4, chunk_overlap=1), "abcdefghij")
+
+    assert all(len(t) <= 4 for t in texts)
+    assert texts[0] == "abcd"
+    assert texts[-1].endswith("j")
+
+
+def test_chunk_ids_are_sequential():
+    chunks = TextChunker(chunk_size=10, chunk_overlap=2).chunk_text(
+        "one two three four five six seven", start_id=3
+    )
+
+    assert [c.chunk_id for c in chunks] == list(range(3, 3 + len(chunks)))
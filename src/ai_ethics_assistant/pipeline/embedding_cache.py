@@ -0,0 +1,102 @@
+import asyncio
+import hashlib
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Stay below SQLite's default limit on bound parameters per statement
+_MAX_QUERY_PARAMS = 500
+
+
+class EmbeddingCacheError(Exception):
+    pass
+
+
+class EmbeddingCache:
+    """Persistent SQLite store of chunk embeddings keyed by model and text
+
+    Re-ingesting an unchanged PDF produces the same chunks, so their vectors
+    can be read back instead of recomputed by the model.
+    """
+
+    def __init__(self, path: str, model_name: str, dtype: type = np.float16):
+        """Open (or create) the cache database
+
+        Args:
+            path: SQLite database file
+            model_name: Embedding model the cached vectors belong to
+            dtype: Vector dtype as stored on disk
+        """
+        try:
+            self.path = path
+            self.model_name = model_name
+            self.dtype = dtype
+            # Queries run in worker threads; the lock serializes them since a
+            # connection must not be used by two threads at once
+            self._lock = threading.Lock()
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings "
+                "(key BLOB PRIMARY KEY, vector BLOB NOT NULL) WITHOUT ROWID"
+            )
+            self._conn.commit()
+
+            logger.info(f"Opened embedding cache at {path}")
+
+        except Exception as e:
+            raise EmbeddingCacheError(f"Failed to open embedding cache: {e}")
+
+    def key(self, text: str) -> bytes:
+        """Cache key for a chunk of text under this cache's model"""
+        return hashlib.sha256(f"{self.model_name}\0{text}".encode()).digest()
+
+    async def get_many(self, keys: list[bytes]) -> dict[bytes, np.ndarray]:
+        """Look up cached vectors, returning only the keys that were found"""
+        try:
+            return await asyncio.to_thread(self._get_many, keys)
+        except Exception as e:
+            raise EmbeddingCacheError(f"Failed to read embedding cache: {e}")
+
+    async def put_many(self, keys: list[bytes], vectors: np.ndarray) -> None:
+        """Store one vector per key, replacing any existing entry"""
+        try:
+            await asyncio.to_thread(self._put_many, keys, vectors)
+        except Exception as e:
+            raise EmbeddingCacheError(f"Failed to write embedding cache: {e}")
+
+    def close(self) -> None:
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+
+    def _get_many(self, keys: list[bytes]) -> dict[bytes, np.ndarray]:
+        found = {}
+        with self._lock:
+            for start in range(0, len(keys), _MAX_QUERY_PARAMS):
+                batch = keys[start : start + _MAX_QUERY_PARAMS]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})",
+                    batch,
+                )
+                for key, vector in rows:
+                    found[key] = np.frombuffer(vector, dtype=self.dtype)
+        return found
+
+    def _put_many(self, keys: list[bytes], vectors: np.ndarray) -> None:
+        rows = [
+            (key, vector.astype(self.dtype, copy=False).tobytes())
+            for key, vector in zip(keys, vectors)
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)", rows
+            )
+            self._conn.commit()
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from ai_ethics_assistant.pipeline.embedding_cache import EmbeddingCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = EmbeddingCache(str(tmp_path / "cache.db"), "model-a")
+    yield cache
+    cache.close()
+
+
+@pytest.mark.anyio
+async def test_miss_returns_nothing(cache):
+    assert await cache.get_many([cache.key("never stored")]) == {}
+
+
+@pytest.mark.anyio
+async def test_hit_returns_stored_vector(cache):
+    keys = [cache.key("first"), cache.key("second")]
+    vectors = np.array([[0.5, -1.0, 2.0], [1.0, 0.0, 0.25]], dtype=np.float32)
+    await cache.put_many(keys, vectors)
+
+    found = await cache.get_many([*keys, cache.key("missing")])
+
+    assert set(found) == set(keys)
+    np.testing.assert_array_equal(found[keys[0]], vectors[0])
+    np.testing.assert_array_equal(found[keys[1]], vectors[1])
+
+
+@pytest.mark.anyio
+async def test_round_trip_uses_storage_dtype(cache):
+    key = cache.key("text")
+    vector = np.array([[0.1, 0.2, 0.3]], dtype=np.float32)
+    await cache.put_many([key], vector)
+
+    found = (await cache.get_many([key]))[key]
+
+    assert found.dtype == np.float16
+    np.testing.assert_array_equal(found, vector[0].astype(np.float16))
+
+
+@pytest.mark.anyio
+async def test_entries_are_separated_by_model(tmp_path, cache):
+    other = EmbeddingCache(str(tmp_path / "cache.db"), "model-b")
+    try:
+        assert cache.key("text") != other.key("text")
+
+        await cache.put_many([cache.key("text")], np.ones((1, 3), dtype=np.float32))
+
+        assert await other.get_many([other.key("text")]) == {}
+    finally:
+        other.close()
+
+
+@pytest.mark.anyio
+async def test_persists_across_reopen(tmp_path):
+    path = str(tmp_path / "cache.db")
+    cache = EmbeddingCache(path, "model-a")
+    await cache.put_many([cache.key("text")], np.ones((1, 3), dtype=np.float32))
+    cache.close()
+
+    reopened = EmbeddingCache(path, "model-a")
+    try:
+        assert reopened.key("text") in await reopened.get_many([reopened.key("text")])
+    finally:
+        reopened.close()
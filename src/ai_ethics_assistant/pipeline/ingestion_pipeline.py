@@ -1,16 +1,32 @@
+import asyncio
 import hashlib
 import logging
+import posixpath
+from collections.abc import AsyncIterator
 from datetime import datetime, timezone
 from uuid import NAMESPACE_DNS, uuid5
 
+import numpy as np
+
 from ai_ethics_assistant.configuration import Config
-from ai_ethics_assistant.pipeline.embedder import HuggingFaceEmbedder, TextChunker
+from ai_ethics_assistant.pipeline.embedder import (
+    Chunk,
+    HuggingFaceEmbedder,
+    TextChunker,
+)
+from ai_ethics_assistant.pipeline.embedding_cache import EmbeddingCache
 from ai_ethics_assistant.pipeline.pdf_processor import DoclingPDFProcessor
 from ai_ethics_assistant.services.s3_service import S3Service
 from ai_ethics_assistant.services.vector_store_service import VectorStoreService
 
 logger = logging.getLogger(__name__)
 
+# (pdf_key, point_id, payload) for one chunk travelling through the pipeline
+_ChunkRecord = tuple[str, str, dict]
+
+# Seconds to wait before each check that a document's upserts have applied
+_STORED_CHECK_DELAYS = (0.0, 0.5, 1.0, 2.0, 4.0)
+
 
 class IngestionPipelineError(Exception):
     pass
@@ -25,6 +41,7 @@ class IngestionPipeline:
         vector_store_service: VectorStoreService,
         embedder: HuggingFaceEmbedder,
         config: Config,
+        pdf_processor: DoclingPDFProcessor | None = None,
     ):
         self.s3_service = s3_service
         self.vector_store_service = vector_store_service
@@ -32,13 +49,31 @@ class IngestionPipeline:
         self.config = config
 
         # Initialize processing components
-        self.pdf_processor = DoclingPDFProcessor()
+        self.pdf_processor = pdf_processor or DoclingPDFProcessor(
+            max_workers=config.docling_workers,
+            max_tasks_per_child=config.docling_max_tasks_per_child,
+            pdf_backend=config.pdf_backend,
+            pages_per_task=config.docling_pages_per_task,
+        )
         self.text_chunker = TextChunker(
             chunk_size=config.chunk_size, chunk_overlap=config.chunk_overlap
         )
+        self.embedding_cache = (
+            EmbeddingCache(
+                config.embedding.cache_path, embedder.model_name, embedder.dtype
+            )
+            if config.embedding.cache_path
+            else None
+        )
 
         logger.info("Initialized ingestion pipeline")
 
+    def close(self) -> None:
+        """Release resources held by the pipeline"""
+        self.pdf_processor.close()
+        if self.embedding_cache is not None:
+            self.embedding_cache.close()
+
     async def ingest_all_pdfs(self) -> dict:
         """Process all PDFs in S3 bucket"""
         try:
@@ -47,33 +82,120 @@ class IngestionPipeline:
             # List all PDFs in bucket
             pdf_keys = await self.s3_service.list_pdfs()
 
+        except Exception as e:
+            raise IngestionPipelineError(f"Failed to ingest PDFs: {e}")
+
+        return await self.ingest_pdfs(pdf_keys)
+
+    async def ingest_pdfs(self, pdf_keys: list[str]) -> dict:
+        """Process the given PDFs
+
+        Runs as a bounded three-stage pipeline so that downloading/parsing,
+        embedding and uploading of different PDFs overlap:
+        PDF workers -> chunk queue -> embedding worker -> concurrent uploads
+        """
+        try:
             if not pdf_keys:
-                logger.info("No PDF files found in bucket")
+                logger.info("No PDF files to process")
                 return {"processed": 0, "failed": 0, "files": []}
 
-            logger.info(f"Found {len(pdf_keys)} PDF files to process")
+            logger.info(f"Processing {len(pdf_keys)} PDF files")
 
-            results = {"processed": 0, "failed": 0, "files": []}
+            file_chunks: dict[str, int] = {}
+            file_errors: dict[str, str] = {}
+            unchanged: set[str] = set()
+            # pdf_key -> content hash of every document being re-stored
+            rewritten: dict[str, str] = {}
+            queue: asyncio.Queue[_ChunkRecord | None] = asyncio.Queue(
+                maxsize=2 * self.config.embedding.batch_size
+            )
+            # Downloads run ahead of parsing so the next PDFs are already in
+            # memory when a parse slot frees up; holding a fetch slot until
+            # the PDF is processed bounds how many are buffered
+            fetch_slots = asyncio.Semaphore(
+                max(self.config.s3.download_concurrency, self.config.ingest_concurrency)
+            )
+            parse_slots = asyncio.Semaphore(self.config.ingest_concurrency)
+            upload_slots = asyncio.Semaphore(self.config.vector_db.upsert_concurrency)
 
-            # Process each PDF individually
-            for pdf_key in pdf_keys:
+            async def produce(pdf_key: str) -> None:
                 try:
-                    result = await self.ingest_single_pdf(pdf_key)
+                    async with fetch_slots:
+                        pdf_content = await self.s3_service.download_pdf(pdf_key)
+                        content_hash = hashlib.blake2b(
+                            pdf_content, digest_size=16
+                        ).hexdigest()
+
+                        stored_count = await self._count_unchanged_chunks(
+                            pdf_key, content_hash
+                        )
+                        if stored_count is not None:
+                            logger.info(f"Skipping {pdf_key}: content unchanged")
+                            file_chunks[pdf_key] = stored_count
+                            unchanged.add(pdf_key)
+                            return
+
+                        async with parse_slots:
+                            rewritten[pdf_key] = content_hash
+                            count = 0
+                            async for point_id, payload in self._iter_pdf_chunks(
+                                pdf_key, pdf_content
+                            ):
+                                await queue.put((pdf_key, point_id, payload))
+                                count += 1
+                    file_chunks[pdf_key] = count
+                except Exception as e:
+                    file_errors[pdf_key] = str(e)
+                    logger.error(f"Failed to process {pdf_key}: {e}")
+
+            async def produce_all() -> None:
+                await asyncio.gather(*[produce(key) for key in pdf_keys])
+                await queue.put(None)
+
+            async with asyncio.TaskGroup() as tg:
+                tg.create_task(produce_all())
+                tg.create_task(self._embed_worker(queue, tg, upload_slots, file_errors))
+
+            # Every upload has been acknowledged by now, though Qdrant may
+            # still be applying some (they go out with wait=False)
+
+            # Don't leave partly stored documents around for searches
+            for pdf_key in file_errors.keys() & rewritten.keys():
+                await self._delete_existing_chunks(self._generate_document_id(pdf_key))
+
+            # Record the content hash that lets the next run skip a document
+            # once its chunks are verifiably stored. A crash before this point
+            # leaves it unmarked, so it gets re-ingested
+            await asyncio.gather(
+                *[
+                    self._mark_complete(pdf_key, content_hash, file_chunks[pdf_key])
+                    for pdf_key, content_hash in rewritten.items()
+                    if pdf_key not in file_errors and file_chunks[pdf_key]
+                ]
+            )
+
+            results = {"processed": 0, "failed": 0, "files": []}
+            for pdf_key in pdf_keys:
+                if pdf_key in file_errors:
+                    results["failed"] += 1
+                    results["files"].append(
+                        {
+                            "file": pdf_key,
+                            "status": "failed",
+                            "error": file_errors[pdf_key],
+                        }
+                    )
+                else:
                     results["processed"] += 1
                     results["files"].append(
                         {
                             "file": pdf_key,
                             "status": "success",
-                            "chunks": result["chunks"],
+                            "chunks": file_chunks[pdf_key],
+                            "unchanged": pdf_key in unchanged,
                         }
                     )
                     logger.info(f"Successfully processed {pdf_key}")
-                except Exception as e:
-                    results["failed"] += 1
-                    results["files"].append(
-                        {"file": pdf_key, "status": "failed", "error": str(e)}
-                    )
-                    logger.error(f"Failed to process {pdf_key}: {e}")
 
             logger.info(
                 f"Ingestion complete: {results['processed']} succeeded, {results['failed']} failed"
@@ -84,80 +206,230 @@ class IngestionPipeline:
             raise IngestionPipelineError(f"Failed to ingest PDFs: {e}")
 
     async def ingest_single_pdf(self, pdf_key: str) -> dict:
-        """Process a single PDF file with deduplication"""
-        try:
-            logger.info(f"Processing PDF: {pdf_key}")
+        """Process a single PDF file with deduplication
+
+        Goes through the same pipeline as ingest_pdfs, so uploads of one
+        batch overlap embedding of the next.
+        """
+        results = await self.ingest_pdfs([pdf_key])
+        file_result = results["files"][0]
+        if file_result["status"] == "failed":
+            raise IngestionPipelineError(
+                f"Failed to process {pdf_key}: {file_result['error']}"
+            )
 
-            # Generate consistent document ID from filename
-            document_id = self._generate_document_id(pdf_key)
+        if not file_result["chunks"]:
+            logger.warning(f"No chunks created for {pdf_key}")
+        return {"chunks": file_result["chunks"], "unchanged": file_result["unchanged"]}
+
+    async def _iter_pdf_chunks(
+        self, pdf_key: str, pdf_content: bytes | bytearray
+    ) -> AsyncIterator[tuple[str, dict]]:
+        """Parse and chunk a downloaded PDF, yielding (point_id, payload) pairs
+
+        Pages are chunked as they come out of the PDF processor, so chunking
+        starts before the whole document has been split up.
+        """
+        logger.info(f"Processing PDF: {pdf_key}")
+
+        # Generate consistent document ID from filename
+        document_id = self._generate_document_id(pdf_key)
+
+        # Step 1: Delete existing chunks for this document (deduplication)
+        await self._delete_existing_chunks(document_id)
+
+        filename = posixpath.basename(pdf_key)  # Extract filename from S3 key
+        metadata = {
+            "filename": filename,
+            "document_id": document_id,
+            "file_size": len(pdf_content),
+            "processed_date": datetime.now(timezone.utc).isoformat(),
+        }
+        # Deterministic UUIDs: hash the namespace once per document, then
+        # derive each chunk's id from just its chunk_id
+        document_ns = uuid5(NAMESPACE_DNS, document_id)
+
+        def to_point(chunk: Chunk) -> tuple[str, dict]:
+            # Shared document metadata plus this chunk's own fields
+            payload = {**chunk.metadata, "text": chunk.text, "chunk_id": chunk.chunk_id}
+            return str(uuid5(document_ns, str(chunk.chunk_id))), payload
+
+        # Step 2: Process PDF to extract text, then chunk it page by page.
+        # A page's last chunk may run on into the next page, so it is held
+        # back and chunked again together with that page's text
+        next_chunk_id = 0
+        pending: Chunk | None = None
+        async for page_text in self.pdf_processor.process_pdf_pages(
+            pdf_content, pdf_key
+        ):
+            if pending is not None:
+                page_text = f"{pending.text}\n\n{page_text.lstrip()}"
+            chunks = self.text_chunker.chunk_text(page_text, metadata, next_chunk_id)
+            if not chunks:
+                continue
 
-            # Step 1: Delete existing chunks for this document (deduplication)
-            await self._delete_existing_chunks(document_id)
+            pending = chunks.pop()
+            next_chunk_id += len(chunks)
+            for chunk in chunks:
+                yield to_point(chunk)
 
-            # Step 2: Download PDF from S3
-            pdf_content = await self.s3_service.download_pdf(pdf_key)
-            file_size = len(pdf_content)
+        if pending is not None:
+            yield to_point(pending)
 
-            # Step 3: Process PDF to extract text
-            text = await self.pdf_processor.process_pdf(pdf_content, pdf_key)
+    async def _embed_worker(
+        self,
+        queue: asyncio.Queue[_ChunkRecord | None],
+        tg: asyncio.TaskGroup,
+        upload_slots: asyncio.Semaphore,
+        file_errors: dict[str, str],
+    ) -> None:
+        """Group queued chunks into embedding batches and hand them to uploads"""
+        batch_size = self.config.embedding.batch_size
+        done = False
+        while not done:
+            record = await queue.get()
+            if record is None:
+                break
+
+            # Take whatever else is already queued, up to one full batch
+            batch = [record]
+            while len(batch) < batch_size:
+                try:
+                    record = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                if record is None:
+                    done = True
+                    break
+                batch.append(record)
+
+            try:
+                vectors = await self._embed(
+                    [payload["text"] for _, _, payload in batch]
+                )
+            except Exception as e:
+                self._fail_batch(batch, e, file_errors)
+                continue
 
-            # Step 4: Chunk text into optimal sizes
-            filename = pdf_key.split("/")[-1]  # Extract filename from S3 key
-            metadata = {
-                "filename": filename,
-                "document_id": document_id,
-                "file_size": file_size,
-                "processed_date": datetime.now(timezone.utc).isoformat(),
-            }
+            await upload_slots.acquire()
+            tg.create_task(self._store_batch(batch, vectors, upload_slots, file_errors))
 
-            chunks = self.text_chunker.chunk_text(text, metadata)
+    async def _embed(self, texts: list[str]) -> np.ndarray:
+        """Embed texts, reusing cached vectors and only running the model on misses"""
+        if self.embedding_cache is None:
+            return await self.embedder.embed_batch(texts)
 
-            if not chunks:
-                logger.warning(f"No chunks created for {pdf_key}")
-                return {"chunks": 0}
-
-            # Step 5: Generate embeddings for all chunks
-            chunk_texts = [chunk["text"] for chunk in chunks]
-            embeddings = await self.embedder.embed_batch(chunk_texts)
-
-            # Step 6: Prepare data for vector store
-            embeddings_data = []
-            for chunk, embedding in zip(chunks, embeddings):
-                # Update chunk metadata with actual chunk info
-                payload = chunk["metadata"].copy()
-                payload["text"] = chunk["text"]
-                payload["chunk_id"] = chunk["chunk_id"]
-
-                # Generate deterministic UUID from document_id and chunk_id
-                point_id = str(
-                    uuid5(NAMESPACE_DNS, f"{document_id}_chunk_{chunk['chunk_id']}")
-                )
+        keys = [self.embedding_cache.key(text) for text in texts]
+        cached = await self.embedding_cache.get_many(keys)
+        miss_idx = [i for i, key in enumerate(keys) if key not in cached]
+
+        vectors = np.empty(
+            (len(texts), self.embedder.dimension), dtype=self.embedder.dtype
+        )
+        for i, key in enumerate(keys):
+            if key in cached:
+                vectors[i] = cached[key]
 
-                embeddings_data.append(
-                    {
-                        "id": point_id,
-                        "vector": embedding,
-                        "payload": payload,
-                    }
+        if miss_idx:
+            fresh = await self.embedder.embed_batch([texts[i] for i in miss_idx])
+            vectors[miss_idx] = fresh
+            await self.embedding_cache.put_many([keys[i] for i in miss_idx], fresh)
+
+        logger.debug(f"Embedding cache: {len(cached)} hits, {len(miss_idx)} misses")
+        return vectors
+
+    async def _store_batch(
+        self,
+        batch: list[_ChunkRecord],
+        vectors: np.ndarray,
+        upload_slots: asyncio.Semaphore,
+        file_errors: dict[str, str],
+    ) -> None:
+        try:
+            await self.vector_store_service.store_vectors(
+                [point_id for _, point_id, _ in batch],
+                vectors,
+                [payload for _, _, payload in batch],
+            )
+        except Exception as e:
+            self._fail_batch(batch, e, file_errors)
+        finally:
+            upload_slots.release()
+
+    def _fail_batch(
+        self, batch: list[_ChunkRecord], error: Exception, file_errors: dict[str, str]
+    ) -> None:
+        for pdf_key in {pdf_key for pdf_key, _, _ in batch}:
+            file_errors.setdefault(pdf_key, str(error))
+            logger.error(f"Failed to process {pdf_key}: {error}")
+
+    async def _mark_complete(
+        self, pdf_key: str, content_hash: str, chunk_count: int
+    ) -> None:
+        """Record on a fully stored document's chunks what content they hold
+
+        Upserts are acknowledged before Qdrant applies them, so the stored
+        count is polled until it reaches chunk_count. A document that never
+        gets there stays unmarked and is re-ingested next run.
+        """
+        document_id = self._generate_document_id(pdf_key)
+        try:
+            for delay in _STORED_CHECK_DELAYS:
+                await asyncio.sleep(delay)
+                stored_count = await self.vector_store_service.count_by_filter(
+                    {"document_id": document_id}
+                )
+                if stored_count == chunk_count:
+                    break
+            else:
+                logger.warning(
+                    f"Only {stored_count} of {chunk_count} chunks of {pdf_key} "
+                    "were stored; leaving it to be re-ingested"
                 )
+                return
 
-            # Step 7: Store embeddings in vector database
-            await self.vector_store_service.store_embeddings(embeddings_data)
+            await self.vector_store_service.set_payload_by_filter(
+                {"document_id": document_id},
+                {"content_hash": content_hash, "chunk_count": chunk_count},
+            )
 
-            logger.info(
-                f"Successfully processed {pdf_key}: {len(chunks)} chunks stored"
+        except Exception as e:
+            # The document stays unmarked and is simply re-ingested next run
+            logger.warning(f"Failed to mark {pdf_key} as complete: {e}")
+
+    async def _count_unchanged_chunks(
+        self, pdf_key: str, content_hash: str
+    ) -> int | None:
+        """Number of stored chunks if the PDF was already fully ingested with this content"""
+        document_id = self._generate_document_id(pdf_key)
+        try:
+            payload = await self.vector_store_service.find_payload(
+                {"document_id": document_id}, fields=["content_hash", "chunk_count"]
+            )
+            if payload is None or payload.get("content_hash") != content_hash:
+                return None
+
+            # The marker is written after all chunks landed, but check the
+            # count too so a half-stored document is never skipped
+            stored_count = await self.vector_store_service.count_by_filter(
+                {"document_id": document_id}
             )
-            return {"chunks": len(chunks)}
+            if stored_count != payload.get("chunk_count"):
+                logger.info(f"Stored chunks of {pdf_key} are incomplete")
+                return None
+            return stored_count
 
         except Exception as e:
-            raise IngestionPipelineError(f"Failed to process {pdf_key}: {e}")
+            # Fall back to a full re-ingest if the lookup fails
+            logger.warning(f"Failed to check stored content of {pdf_key}: {e}")
+            return None
 
     def _generate_document_id(self, pdf_key: str) -> str:
         """Generate consistent document ID hash from S3 key"""
         # Remove S3 prefix to get the clean filename
         cleaned_name = pdf_key.replace(self.config.s3.pdf_prefix, "")
-        # Generate SHA-256 hash for consistent, collision-resistant ID
-        return hashlib.sha256(cleaned_name.encode()).hexdigest()[:16]
+        # 64-bit BLAKE2b digest: exactly 16 hex chars, no truncation needed
+        return hashlib.blake2b(cleaned_name.encode(), digest_size=8).hexdigest()
 
     async def _delete_existing_chunks(self, document_id: str) -> None:
         """Delete existing chunks for a document (deduplication)"""
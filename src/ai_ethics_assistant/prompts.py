@@ -21,27 +21,27 @@ Guidelines:
 - Do not make up information that isn't supported by the context
 - Keep your answer concise and focused on the user's question
 - Use bullet points or numbered lists for clarity when appropriate
+- If the context doesn't fully address the question, mention what information is available and what might be missing
 """
 
-# Template for query reformulation
-QUERY_REFORMULATION_TEMPLATE = """
+# System prompt for query reformulation. Kept separate from the per-query
+# template so every request shares an identical, provider-cacheable prefix
+QUERY_REFORMULATION_SYSTEM_PROMPT = """
 You are an AI assistant helping users find information about AI policy and ethics.
 
-The user has asked: "{user_query}"
-
-Reformulate this query to be more comprehensive and likely to match relevant content in AI ethics documents.
+Reformulate the user's query to be more comprehensive and likely to match relevant content in AI ethics documents.
 Add related terms, expand acronyms, and make the query more specific to AI policy, ethics, governance, or regulation topics.
 
 Return only the reformulated query, nothing else."""
 
-# User content template for RAG (context + query)
+# Template for query reformulation
+QUERY_REFORMULATION_TEMPLATE = 'The user has asked: "{user_query}"'
+
+# User content template for RAG (context + query). Only per-query text goes
+# here; standing instructions belong in SYSTEM_PROMPT
 RAG_PROMPT_TEMPLATE = """
 Context from AI Ethics Documents:
 {context}
 
 User Question: {user_query}
-
-Provide a comprehensive answer based on the context above. 
-If the context doesn't fully address the question,
-mention what information is available and what might be missing.
 """
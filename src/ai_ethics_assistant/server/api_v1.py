@@ -1,7 +1,7 @@
-import json
 import logging
 from typing import Annotated
 
+import orjson
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.responses import StreamingResponse
 
@@ -15,7 +15,10 @@ from ai_ethics_assistant.services.rag_service import RAGService
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/v1")
 
-
+# Constant parts of the SSE frames, so only the token text is encoded per chunk
+SSE_CHUNK_PREFIX = b'data: {"type":"chunk","content":'
+SSE_CHUNK_SUFFIX = b"}\n\n"
+SSE_END_FRAME = b'data: {"type":"end"}\n\n'
 
 
 @router.post("/chat", response_model=ChatResponse, tags=["chat"])
@@ -32,14 +35,9 @@ async def chat(
         if request.stream:
             # Return Server-Sent Events streaming response
             async def stream_response():
-                # First get the query context for metadata
-                context_info = await rag_service.get_context_for_query(
-                    request.query, request.top_k or 5
-                )
-
-                # Stream the response
-                response_generator = await rag_service.ask(
-                    user_query=request.query, stream=True, top_k=request.top_k or 5
+                # Retrieve once; the context doubles as the metadata frame
+                response_generator, context_info = await rag_service.ask_with_context(
+                    user_query=request.query, stream=True, top_k=request.top_k
                 )
 
                 # Send initial metadata as SSE
@@ -51,33 +49,37 @@ async def chat(
                     ),
                     "num_documents": context_info.get("num_documents", 0),
                 }
-                yield f"data: {json.dumps(metadata)}\n\n"
+                yield b"data: " + orjson.dumps(metadata) + b"\n\n"
 
                 # Stream response chunks (check if it's actually a generator)
                 if not isinstance(response_generator, str):
                     async for chunk in response_generator:
                         if chunk:
-                            chunk_data = {"type": "chunk", "content": chunk}
-                            yield f"data: {json.dumps(chunk_data)}\n\n"
+                            yield (
+                                SSE_CHUNK_PREFIX
+                                + orjson.dumps(chunk)
+                                + SSE_CHUNK_SUFFIX
+                            )
 
                 # Send end marker
-                yield f"data: {json.dumps({'type': 'end'})}\n\n"
+                yield SSE_END_FRAME
 
             return StreamingResponse(
                 stream_response(),
                 media_type="text/event-stream",
-                headers={"Cache-Control": "no-cache", "Connection": "keep-alive"},
+                # X-Accel-Buffering stops nginx-style proxies from holding
+                # back SSE frames until their buffer fills
+                headers={
+                    "Cache-Control": "no-cache",
+                    "Connection": "keep-alive",
+                    "X-Accel-Buffering": "no",
+                },
             )
         else:
             # Regular non-streaming response
-            # Get context info for response metadata
-            context_info = await rag_service.get_context_for_query(
-                request.query, request.top_k or 5
-            )
-
-            # Generate response
-            answer = await rag_service.ask(
-                user_query=request.query, stream=False, top_k=request.top_k or 5
+            # Generate response along with its context info for metadata
+            answer, context_info = await rag_service.ask_with_context(
+                user_query=request.query, stream=False, top_k=request.top_k
             )
 
             if not isinstance(answer, str):
@@ -99,7 +101,3 @@ async def chat(
         raise HTTPException(
             status_code=500, detail=f"Failed to process query: {str(e)}"
         )
-
-
-
-
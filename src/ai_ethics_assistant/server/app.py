@@ -7,13 +7,8 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from ai_ethics_assistant.configuration import Config
 from ai_ethics_assistant.dependencies import Dependencies
-from ai_ethics_assistant.pipeline.embedder import HuggingFaceEmbedder
 from ai_ethics_assistant.server.api_v1 import router as api_v1_endpoints
 from ai_ethics_assistant.server.internal import router as internal_endpoints
-from ai_ethics_assistant.services.llm_service import LLMService
-from ai_ethics_assistant.services.rag_service import RAGService
-from ai_ethics_assistant.services.s3_service import S3Service
-from ai_ethics_assistant.services.vector_store_service import VectorStoreService
 from ai_ethics_assistant.version import __version__
 
 logger = logging.getLogger(__name__)
@@ -35,24 +30,29 @@ def build_app(cfg: Config, **kwargs) -> FastAPI:
             logger.warning("Setting up application")
 
             # Initialize services
-            s3_service = S3Service(cfg.s3)
-            vector_store_service = VectorStoreService(cfg.vector_db)
-            embedder = HuggingFaceEmbedder(cfg.embedding.model_name)
-
-            # Test S3 connection during startup (fail fast)
-            if not await s3_service.test_connection():
+            dependencies = Dependencies(cfg)
+            s3_service = dependencies.s3_service
+            vector_store_service = dependencies.vector_store_service
+            # Load the embedding model now rather than on the first request
+            embedder = dependencies.embedder
+
+            # Test S3 and Qdrant connections during startup (fail fast)
+            s3_ok, qdrant_ok = await asyncio.gather(
+                s3_service.test_connection(), vector_store_service.test_connection()
+            )
+            if not s3_ok:
                 raise RuntimeError("Failed to connect to S3 service")
-
-            # Test Qdrant connection during startup (fail fast)
-            if not await vector_store_service.test_connection():
+            if not qdrant_ok:
                 raise RuntimeError("Failed to connect to Qdrant service")
 
             # Ensure collection exists
-            await vector_store_service.ensure_collection()
+            await vector_store_service.ensure_collection(
+                embedder.get_embedding_dimension()
+            )
 
             # Initialize RAG services
             try:
-                llm_service = LLMService(cfg.llm)
+                llm_service = dependencies.llm_service
             except Exception as e:
                 logger.error(f"Failed to initialize LLM service: {e}")
                 logger.error(
@@ -60,7 +60,7 @@ def build_app(cfg: Config, **kwargs) -> FastAPI:
                 )
                 raise RuntimeError(f"LLM service initialization failed: {e}")
 
-            rag_service = RAGService(llm_service, embedder, vector_store_service)
+            _ = dependencies.rag_service
 
             # Test LLM connection during startup (fail fast)
             if not await llm_service.test_connection():
@@ -69,14 +69,7 @@ def build_app(cfg: Config, **kwargs) -> FastAPI:
                 )
 
             # Initialize dependencies
-            app.state.dependencies = Dependencies(
-                config=cfg,
-                s3_service=s3_service,
-                vector_store_service=vector_store_service,
-                embedder=embedder,
-                llm_service=llm_service,
-                rag_service=rag_service,
-            )
+            app.state.dependencies = dependencies
             app.state.readiness_lock = readiness_lock
 
         try:
@@ -86,6 +79,9 @@ def build_app(cfg: Config, **kwargs) -> FastAPI:
             yield
         finally:
             # Cleanup on shutdown
+            await vector_store_service.close()
+            await s3_service.close()
+            await llm_service.close()
             logger.warning("Application cleanup complete")
 
     app = FastAPI(
@@ -1,7 +1,9 @@
+import functools
 import logging
 from typing import Annotated
 
-from fastapi import APIRouter, Depends
+import orjson
+from fastapi import APIRouter, Depends, Response
 
 from ai_ethics_assistant.configuration import Config
 from ai_ethics_assistant.dependencies import get_config
@@ -10,13 +12,27 @@ from ai_ethics_assistant.version import __version__
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# Probe responses only depend on startup state, so they are encoded once
+# instead of being serialized on every probe
+_LIVENESS_BODY = orjson.dumps(f"OK: {__version__}")
+
+
+@functools.lru_cache(maxsize=2)
+def _health_body(dev_mode: bool) -> bytes:
+    return orjson.dumps(
+        {
+            "status": "healthy",
+            "message": f"AI Ethics Assistant API is running (dev_mode: {dev_mode})",
+        }
+    )
+
 
 @router.get("/liveness", tags=["ops"])
-def liveness_check():
+async def liveness_check():
     """
     Check if the server is running.
     """
-    return f"OK: {__version__}"
+    return Response(content=_LIVENESS_BODY, media_type="application/json")
 
 
 @router.get("/health", tags=["ops"])
@@ -25,7 +41,6 @@ async def health_check(config: Annotated[Config, Depends(get_config)]):
     """
     Check if the API is healthy and running.
     """
-    return {
-        "status": "healthy", 
-        "message": f"AI Ethics Assistant API is running (dev_mode: {config.dev_mode})"
-    }
+    return Response(
+        content=_health_body(config.dev_mode), media_type="application/json"
+    )
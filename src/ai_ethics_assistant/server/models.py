@@ -18,7 +18,7 @@ class ChatRequest(BaseModel):
     stream: Optional[bool] = Field(
         False, description="Whether to stream the response using Server-Sent Events"
     )
-    top_k: Optional[int] = Field(
+    top_k: int = Field(
         5,
         ge=1,
         le=20,
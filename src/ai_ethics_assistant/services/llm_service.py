@@ -1,13 +1,22 @@
 import logging
+import time
+import unicodedata
+from collections import OrderedDict
 from typing import AsyncGenerator
 
-from huggingface_hub import InferenceClient
+from huggingface_hub import AsyncInferenceClient
 
 from ai_ethics_assistant.configuration import LLMConfig
-from ai_ethics_assistant.prompts import QUERY_REFORMULATION_TEMPLATE
+from ai_ethics_assistant.prompts import (
+    QUERY_REFORMULATION_SYSTEM_PROMPT,
+    QUERY_REFORMULATION_TEMPLATE,
+)
 
 logger = logging.getLogger(__name__)
 
+# Bound once at import rather than looked up on every request
+_format_reformulation_prompt = QUERY_REFORMULATION_TEMPLATE.format
+
 
 class LLMServiceError(Exception):
     pass
@@ -18,19 +27,31 @@ class LLMService:
 
     def __init__(self, config: LLMConfig):
         self.config = config
-        self.client = InferenceClient(
+        self.client = AsyncInferenceClient(
             provider="featherless-ai", api_key=config.api_key.get_secret_value()
         )
+        # Canonicalized query -> reformulation, oldest first
+        self._reformulation_cache: OrderedDict[str, str] = OrderedDict()
+        # Monotonic time of the last successful connection test
+        self._last_healthy = 0.0
 
     async def reformulate_query(self, user_query: str) -> str:
         """Reformulate user query to improve search results"""
-        reformulation_prompt = QUERY_REFORMULATION_TEMPLATE.format(
-            user_query=user_query
-        )
+        # Case and whitespace variants of a recent query reuse its rewrite
+        cache_key = unicodedata.normalize("NFKC", user_query.strip().lower())
+        cached = self._reformulation_cache.get(cache_key)
+        if cached is not None:
+            self._reformulation_cache.move_to_end(cache_key)
+            return cached
+
+        reformulation_prompt = _format_reformulation_prompt(user_query=user_query)
 
         try:
-            reformulated = self._generate_text(
-                reformulation_prompt, system_prompt="", max_tokens=100, temperature=0.3
+            reformulated = await self._generate_text(
+                reformulation_prompt,
+                system_prompt=QUERY_REFORMULATION_SYSTEM_PROMPT,
+                max_tokens=100,
+                temperature=0.3,
             )
 
             reformulated = reformulated.strip()
@@ -41,6 +62,10 @@ class LLMService:
                 return user_query
 
             logger.info(f"Query reformulated: '{user_query}' -> '{reformulated}'")
+            # Only successful rewrites are cached, so failures get retried
+            self._reformulation_cache[cache_key] = reformulated
+            if len(self._reformulation_cache) > self.config.reformulation_cache_size:
+                self._reformulation_cache.popitem(last=False)
             return reformulated
 
         except Exception as e:
@@ -59,9 +84,9 @@ class LLMService:
         if should_stream:
             return self._generate_streaming(prompt, system_prompt=system_prompt)
         else:
-            return self._generate_text(prompt, system_prompt=system_prompt)
+            return await self._generate_text(prompt, system_prompt=system_prompt)
 
-    def _generate_text(
+    async def _generate_text(
         self,
         prompt: str,
         system_prompt: str,
@@ -76,7 +101,7 @@ class LLMService:
                 {"role": "user", "content": prompt},
             ]
 
-            completion = self.client.chat.completions.create(
+            completion = await self.client.chat.completions.create(
                 model=self.config.model_name,
                 messages=messages,
                 max_tokens=max_tokens or self.config.max_tokens,
@@ -101,7 +126,7 @@ class LLMService:
                 {"role": "user", "content": prompt},
             ]
 
-            stream = self.client.chat.completions.create(
+            stream = await self.client.chat.completions.create(
                 model=self.config.model_name,
                 messages=messages,
                 max_tokens=self.config.max_tokens,
@@ -109,7 +134,7 @@ class LLMService:
                 stream=True,
             )
 
-            for chunk in stream:
+            async for chunk in stream:
                 if chunk.choices[0].delta.content:
                     yield chunk.choices[0].delta.content
 
@@ -117,13 +142,26 @@ class LLMService:
             raise LLMServiceError(f"Streaming failed: {e}")
 
     async def test_connection(self) -> bool:
-        """Test connection to HuggingFace API"""
+        """Test connection to HuggingFace API
+
+        Each test is a billed completion, so a success is trusted for
+        `health_check_ttl` seconds before the API is probed again.
+        """
+        if time.monotonic() - self._last_healthy < self.config.health_check_ttl:
+            return True
+
         try:
-            self._generate_text(
+            await self._generate_text(
                 "Hello", system_prompt="", max_tokens=1, temperature=0.1
             )
+            self._last_healthy = time.monotonic()
             logger.info("Successfully connected to HuggingFace Inference API")
             return True
         except Exception as e:
+            self._last_healthy = 0.0
             logger.error(f"Failed to connect to HuggingFace API: {e}")
             return False
+
+    async def close(self) -> None:
+        """Close the HTTP session used for inference calls"""
+        await self.client.close()
@@ -1,13 +1,28 @@
+import asyncio
 import logging
+import re
 from typing import Any, AsyncGenerator, Dict, List
 
-from ai_ethics_assistant.pipeline.embedder import HuggingFaceEmbedder
+from ai_ethics_assistant.pipeline.embedder import Embedder
 from ai_ethics_assistant.prompts import RAG_PROMPT_TEMPLATE, SYSTEM_PROMPT
 from ai_ethics_assistant.services.llm_service import LLMService
+from ai_ethics_assistant.services.semantic_cache import SemanticCache
 from ai_ethics_assistant.services.vector_store_service import VectorStoreService
 
 logger = logging.getLogger(__name__)
 
+# All-caps tokens such as "EU" or "GDPR", which reformulation would expand
+_ACRONYM_RE = re.compile(r"\b[A-Z]{2,}\b")
+# Acronyms every document in the corpus already uses as-is
+_COMMON_ACRONYMS = frozenset({"AI"})
+# Bound once at import rather than looked up on every request
+_format_rag_prompt = RAG_PROMPT_TEMPLATE.format
+
+# One retrieved document's block in the LLM context
+_CONTEXT_DOCUMENT_TEMPLATE = "Document {index} (from {filename}):\n{text}\n"
+# Questions shorter than this are too vague to search without reformulating
+_MIN_QUESTION_WORDS = 4
+
 
 class RAGService:
     """Simplified RAG service that handles retrieval and generation"""
@@ -15,15 +30,21 @@ class RAGService:
     def __init__(
         self,
         llm_service: LLMService,
-        embedder: HuggingFaceEmbedder,
+        embedder: Embedder,
         vector_store_service: VectorStoreService,
+        semantic_cache: SemanticCache | None = None,
     ):
         self.llm_service = llm_service
         self.embedder = embedder
         self.vector_store_service = vector_store_service
+        self.semantic_cache = semantic_cache
 
     async def ask(
-        self, user_query: str, stream: bool = False, top_k: int = 5
+        self,
+        user_query: str,
+        stream: bool = False,
+        top_k: int = 5,
+        context_info: Dict[str, Any] | None = None,
     ) -> str | AsyncGenerator[str, None]:
         """Process a user query through the complete RAG pipeline
 
@@ -31,13 +52,16 @@ class RAGService:
             user_query: The user's question
             stream: Whether to stream the response
             top_k: Number of documents to retrieve for context
+            context_info: Result of get_context_for_query for this query, if
+                the caller already has it; skips a second retrieval
 
         Returns:
             Complete response string or async generator of response chunks
         """
         try:
             # Get context for the query
-            context_info = await self.get_context_for_query(user_query, top_k)
+            if context_info is None:
+                context_info = await self.get_context_for_query(user_query, top_k)
             context = context_info["context"]
 
             # Build prompt with context
@@ -52,6 +76,26 @@ class RAGService:
             logger.error(f"RAG pipeline failed for query '{user_query}': {e}")
             return "I encountered an error processing your question. Please try rephrasing or ask a different question."
 
+    async def ask_with_context(
+        self, user_query: str, stream: bool = False, top_k: int = 5
+    ) -> tuple[str | AsyncGenerator[str, None], Dict[str, Any]]:
+        """Answer a query and return the retrieval context used for it
+
+        Args:
+            user_query: The user's question
+            stream: Whether to stream the response
+            top_k: Number of documents to retrieve for context
+
+        Returns:
+            Tuple of the response (string or async generator) and the
+            get_context_for_query result, from a single retrieval
+        """
+        context_info = await self.get_context_for_query(user_query, top_k)
+        answer = await self.ask(
+            user_query, stream=stream, top_k=top_k, context_info=context_info
+        )
+        return answer, context_info
+
     async def get_context_for_query(
         self, user_query: str, top_k: int = 5
     ) -> Dict[str, Any]:
@@ -64,11 +108,39 @@ class RAGService:
         Returns:
             Query processing result with context and metadata
         """
-        # Reformulate query for better search
-        reformulated_query = await self.llm_service.reformulate_query(user_query)
+        # Embed the raw query first so a near-duplicate of a recent question
+        # skips the reformulation call and the vector search altogether
+        user_embedding = None
+        if self.semantic_cache is not None:
+            user_embedding = await self.embedder.embed_text(user_query)
+            cached = self.semantic_cache.get(user_embedding, top_k)
+            if cached is not None:
+                logger.debug(f"Semantic cache hit for query '{user_query}'")
+                return {**cached, "original_query": user_query}
+
+        # Reformulate query for better search, unless it is already a
+        # complete question the rewrite would add little to
+        if not self._needs_reformulation(user_query):
+            logger.info(f"Skipping reformulation of well-formed query '{user_query}'")
+            reformulated_query = user_query
+        elif user_embedding is None:
+            # Embed the original query while the LLM works, in case the
+            # rewrite comes back essentially unchanged
+            reformulated_query, user_embedding = await asyncio.gather(
+                self.llm_service.reformulate_query(user_query),
+                self.embedder.embed_text(user_query),
+            )
+        else:
+            reformulated_query = await self.llm_service.reformulate_query(user_query)
 
         # Generate embedding for reformulated query
-        query_embedding = await self.embedder.embed_text(reformulated_query)
+        if (
+            user_embedding is not None
+            and reformulated_query.strip().lower() == user_query.strip().lower()
+        ):
+            query_embedding = user_embedding
+        else:
+            query_embedding = await self.embedder.embed_text(reformulated_query)
 
         # Search for similar documents
         similar_docs = await self.vector_store_service.search_similar(
@@ -78,31 +150,51 @@ class RAGService:
         # Format context from retrieved documents
         context = self._format_context(similar_docs)
 
-        return {
+        context_info = {
             "original_query": user_query,
             "reformulated_query": reformulated_query,
             "retrieved_documents": similar_docs,
             "context": context,
             "num_documents": len(similar_docs),
         }
+        if self.semantic_cache is not None and user_embedding is not None:
+            self.semantic_cache.put(user_embedding, top_k, context_info)
+        return context_info
+
+    def _needs_reformulation(self, user_query: str) -> bool:
+        """Cheap check for short, fragmentary or acronym-laden queries"""
+        query = user_query.strip()
+        return (
+            len(query.split()) < _MIN_QUESTION_WORDS
+            or not query.endswith("?")
+            or any(
+                acronym not in _COMMON_ACRONYMS
+                for acronym in _ACRONYM_RE.findall(query)
+            )
+        )
 
     def _format_context(self, documents: List[Dict[str, Any]]) -> str:
         """Format retrieved documents into context string"""
         if not documents:
             return "No relevant documents found."
 
-        context_parts = []
-        for i, doc in enumerate(documents, 1):
-            payload = doc.get("payload", {})
-            text = payload.get("text", "")
-            filename = payload.get("filename", "Unknown")
-            context_parts.append(f"Document {i} (from {filename}):\n{text}\n")
-
-        return "\n---\n".join(context_parts)
+        format_document = _CONTEXT_DOCUMENT_TEMPLATE.format
+        return "\n---\n".join(
+            [
+                format_document(
+                    index=i,
+                    filename=payload.get("filename", "Unknown"),
+                    text=payload.get("text", ""),
+                )
+                for i, payload in enumerate(
+                    (doc.get("payload") or {} for doc in documents), 1
+                )
+            ]
+        )
 
     def _build_prompt(self, user_query: str, context: str) -> str:
         """Build the user content for the LLM (context + query only)"""
-        return RAG_PROMPT_TEMPLATE.format(context=context, user_query=user_query)
+        return _format_rag_prompt(context=context, user_query=user_query)
 
     async def health_check(self) -> Dict[str, Any]:
         """Perform health check of RAG components"""
@@ -114,12 +206,18 @@ class RAGService:
         }
 
         try:
-            # Test LLM service
-            llm_healthy = await self.llm_service.test_connection()
-            health_status["llm_service"] = "healthy" if llm_healthy else "unhealthy"
+            # The probes are independent network calls, so run them together
+            results = await asyncio.gather(
+                self.llm_service.test_connection(),
+                self.vector_store_service.test_connection(),
+                return_exceptions=True,
+            )
+            errors = [str(r) for r in results if isinstance(r, BaseException)]
+            if errors:
+                health_status["error"] = "; ".join(errors)
+            llm_healthy, vector_healthy = (r is True for r in results)
 
-            # Test vector store
-            vector_healthy = await self.vector_store_service.test_connection()
+            health_status["llm_service"] = "healthy" if llm_healthy else "unhealthy"
             health_status["vector_store"] = "healthy" if vector_healthy else "unhealthy"
 
             # Overall health
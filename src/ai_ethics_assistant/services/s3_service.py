@@ -1,11 +1,19 @@
+import asyncio
 import logging
+import time
+from contextlib import AsyncExitStack
 
 import aioboto3
+from aiobotocore.config import AioConfig
+from botocore.exceptions import ClientError
 
 from ai_ethics_assistant.configuration import S3Config
 
 logger = logging.getLogger(__name__)
 
+# Size of the pieces a response body is copied into the download buffer in
+_READ_CHUNK_SIZE = 1024 * 1024
+
 
 class S3ServiceError(Exception):
     pass
@@ -19,62 +27,157 @@ class S3Service:
             aws_secret_access_key=config.secret_access_key.get_secret_value(),
             region_name=config.region,
         )
+        # One client (and so one connection pool) is shared by every call
+        # instead of paying TLS and signer setup per request
+        self._client = None
+        self._client_lock = asyncio.Lock()
+        self._exit_stack = AsyncExitStack()
+        # prefix -> (monotonic time listed, PDF keys)
+        self._list_cache: dict[str, tuple[float, list[str]]] = {}
+
+    async def _get_client(self):
+        """Return the shared S3 client, opening it on first use"""
+        if self._client is None:
+            async with self._client_lock:
+                if self._client is None:
+                    self._client = await self._exit_stack.enter_async_context(
+                        self._session.client(
+                            "s3",
+                            config=AioConfig(
+                                max_pool_connections=self.config.max_pool_connections
+                            ),
+                        )
+                    )
+        return self._client
+
+    async def close(self) -> None:
+        """Close the shared S3 client and its connections"""
+        await self._exit_stack.aclose()
+        self._client = None
 
     async def list_pdfs(self, prefix: str = "") -> list[str]:
-        """List all PDF files in the bucket with the given prefix"""
+        """List all PDF files in the bucket with the given prefix
+
+        Results are reused for `list_cache_ttl` seconds, since listing a
+        large bucket takes one request per thousand keys.
+        """
         try:
             full_prefix = (
                 self.config.pdf_prefix + prefix if prefix else self.config.pdf_prefix
             )
 
-            async with self._session.client("s3") as s3:
-                paginator = s3.get_paginator("list_objects_v2")
-                pdf_keys = []
-
-                async for page in paginator.paginate(
-                    Bucket=self.config.bucket_name, Prefix=full_prefix
-                ):
-                    if "Contents" in page:
-                        for obj in page["Contents"]:
-                            key = obj.get("Key", "")
-                            if key and key.lower().endswith(".pdf"):
-                                pdf_keys.append(key)
-
-                logger.info(
-                    f"Found {len(pdf_keys)} PDF files in bucket {self.config.bucket_name}"
-                )
-                return pdf_keys
+            cached = self._list_cache.get(full_prefix)
+            if cached and time.monotonic() - cached[0] < self.config.list_cache_ttl:
+                return list(cached[1])
+
+            s3 = await self._get_client()
+            paginator = s3.get_paginator("list_objects_v2")
+            pdf_keys = []
+
+            # S3 can only filter by prefix, so the extension check stays
+            # client side
+            async for page in paginator.paginate(
+                Bucket=self.config.bucket_name,
+                Prefix=full_prefix,
+                PaginationConfig={"PageSize": 1000},
+            ):
+                for obj in page.get("Contents", ()):
+                    key = obj["Key"]
+                    if key[-4:].lower() == ".pdf":
+                        pdf_keys.append(key)
+
+            logger.info(
+                f"Found {len(pdf_keys)} PDF files in bucket {self.config.bucket_name}"
+            )
+            self._list_cache[full_prefix] = (time.monotonic(), pdf_keys)
+            return list(pdf_keys)
 
         except Exception as e:
             raise S3ServiceError(f"Failed to list PDFs: {e}")
 
-    async def download_pdf(self, key: str) -> bytes:
-        """Download a PDF file by key and return its content as bytes"""
+    async def download_pdf(self, key: str) -> bytes | bytearray:
+        """Download a PDF file by key and return its content as bytes
+
+        The first part is requested as a ranged GET whose Content-Range
+        reveals the object's size, so small PDFs take a single request. The
+        remaining parts of larger objects are fetched as concurrent ranged
+        GETs, since a single stream is capped by one TCP connection's
+        throughput. Response bodies are streamed straight into one
+        preallocated buffer, so the PDF is never held twice.
+        """
         try:
-            async with self._session.client("s3") as s3:
-                response = await s3.get_object(Bucket=self.config.bucket_name, Key=key)
-                content = await response["Body"].read()
+            s3 = await self._get_client()
+            part_size = self.config.part_size
+            try:
+                first = await s3.get_object(
+                    Bucket=self.config.bucket_name,
+                    Key=key,
+                    Range=f"bytes=0-{part_size - 1}",
+                )
+            except ClientError as e:
+                # S3 rejects any range on an empty object
+                if e.response.get("Error", {}).get("Code") == "InvalidRange":
+                    logger.info(f"Downloaded PDF {key} (0 bytes)")
+                    return bytearray()
+                raise
+
+            # "bytes 0-{end}/{size}", absent if the range was ignored and the
+            # whole object came back
+            first_size = first["ContentLength"]
+            content_range = first.get("ContentRange")
+            size = int(content_range.rsplit("/", 1)[1]) if content_range else first_size
+            buffer = bytearray(size)
+            view = memoryview(buffer)
+
+            slots = asyncio.Semaphore(self.config.max_concurrency)
+
+            async def fetch_part(start: int) -> None:
+                end = min(start + part_size, size) - 1
+                async with slots:
+                    response = await s3.get_object(
+                        Bucket=self.config.bucket_name,
+                        Key=key,
+                        Range=f"bytes={start}-{end}",
+                    )
+                    await self._read_into(response["Body"], view[start : end + 1])
+
+            # The first part streams in while the others are requested
+            await asyncio.gather(
+                self._read_into(first["Body"], view[:first_size]),
+                *[fetch_part(start) for start in range(first_size, size, part_size)],
+            )
 
-                logger.info(f"Downloaded PDF {key} ({len(content)} bytes)")
-                return content
+            logger.info(
+                f"Downloaded PDF {key} ({size} bytes in {-(-size // part_size)} parts)"
+            )
+            return buffer
 
         except Exception as e:
             raise S3ServiceError(f"Failed to download PDF '{key}': {e}")
 
+    async def _read_into(self, body, view: memoryview) -> None:
+        """Copy a streaming response body into view as it arrives"""
+        offset = 0
+        async for chunk in body.iter_chunks(_READ_CHUNK_SIZE):
+            view[offset : offset + len(chunk)] = chunk
+            offset += len(chunk)
+        if offset != len(view):
+            raise S3ServiceError(f"Expected {len(view)} bytes, received {offset}")
+
     async def test_connection(self) -> bool:
         """Test S3 bucket access by attempting to list objects"""
         try:
-            async with self._session.client("s3") as s3:
-                await s3.list_objects_v2(
-                    Bucket=self.config.bucket_name,
-                    Prefix=self.config.pdf_prefix,
-                    MaxKeys=1,
-                )
+            s3 = await self._get_client()
+            await s3.list_objects_v2(
+                Bucket=self.config.bucket_name,
+                Prefix=self.config.pdf_prefix,
+                MaxKeys=1,
+            )
 
-                logger.info(
-                    f"Successfully connected to S3 bucket '{self.config.bucket_name}'"
-                )
-                return True
+            logger.info(
+                f"Successfully connected to S3 bucket '{self.config.bucket_name}'"
+            )
+            return True
 
         except Exception as e:
             logger.error(f"Failed to connect to S3: {e}")
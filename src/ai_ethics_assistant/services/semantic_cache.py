@@ -0,0 +1,116 @@
+import itertools
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class SemanticCache:
+    """In-memory LRU of retrieval results keyed by query embedding
+
+    A lookup hits when a cached query's embedding has cosine similarity of at
+    least `threshold` with the new one, so near-duplicate questions skip
+    reformulation and vector search. Entries are bucketed by the signs of a
+    few random projections (LSH), and only the query's bucket and its
+    one-bit neighbours are scanned. Entries expire after `ttl` seconds so
+    results retrieved before a re-ingest are not served indefinitely.
+    """
+
+    def __init__(
+        self,
+        dimension: int,
+        maxsize: int = 1024,
+        threshold: float = 0.95,
+        ttl: float = 300.0,
+        num_planes: int = 6,
+        seed: int = 0,
+    ):
+        """Create an empty cache
+
+        Args:
+            dimension: Embedding vector dimension
+            maxsize: Maximum number of cached entries
+            threshold: Minimum cosine similarity for a hit; vectors must be
+                L2-normalized
+            ttl: Seconds an entry stays valid
+            num_planes: Number of random hyperplanes, giving 2**num_planes
+                buckets per top_k
+            seed: Seed for the random hyperplanes
+        """
+        self.maxsize = maxsize
+        self.threshold = threshold
+        self.ttl = ttl
+        rng = np.random.default_rng(seed)
+        self._planes = rng.standard_normal((num_planes, dimension)).astype(np.float32)
+        self._bits = 1 << np.arange(num_planes)
+        self._ids = itertools.count()
+        # id -> (vector, bucket, value, expiry), least recently used first
+        self._entries: OrderedDict[
+            int, tuple[np.ndarray, tuple, Dict[str, Any], float]
+        ] = OrderedDict()
+        self._buckets: dict[tuple, list[int]] = {}
+
+        logger.info(
+            f"Initialized semantic cache (maxsize={maxsize}, "
+            f"threshold={threshold}, ttl={ttl}s)"
+        )
+
+    def get(self, vector: np.ndarray, top_k: int) -> Dict[str, Any] | None:
+        """Return the value cached for the most similar query, if close enough"""
+        vector = vector.astype(np.float32, copy=False)
+        code = self._code(vector)
+        candidates = [
+            entry_id
+            for probe in self._probes(code)
+            for entry_id in self._buckets.get((top_k, probe), ())
+        ]
+        now = time.monotonic()
+        for entry_id in [i for i in candidates if self._entries[i][3] <= now]:
+            self._remove(entry_id)
+            candidates.remove(entry_id)
+        if not candidates:
+            return None
+
+        scores = np.stack([self._entries[i][0] for i in candidates]) @ vector
+        best = int(scores.argmax())
+        if scores[best] < self.threshold:
+            return None
+
+        entry_id = candidates[best]
+        self._entries.move_to_end(entry_id)
+        return self._entries[entry_id][2]
+
+    def put(self, vector: np.ndarray, top_k: int, value: Dict[str, Any]) -> None:
+        """Cache value for a query embedding, evicting the oldest entry if full"""
+        vector = vector.astype(np.float32)
+        entry_id = next(self._ids)
+        bucket = (top_k, self._code(vector))
+        expiry = time.monotonic() + self.ttl
+        self._entries[entry_id] = (vector, bucket, value, expiry)
+        self._buckets.setdefault(bucket, []).append(entry_id)
+
+        if len(self._entries) > self.maxsize:
+            self._remove(next(iter(self._entries)))
+
+    def clear(self) -> None:
+        """Drop every cached entry"""
+        self._entries.clear()
+        self._buckets.clear()
+
+    def _remove(self, entry_id: int) -> None:
+        _, bucket, _, _ = self._entries.pop(entry_id)
+        members = self._buckets[bucket]
+        members.remove(entry_id)
+        if not members:
+            del self._buckets[bucket]
+
+    def _code(self, vector: np.ndarray) -> int:
+        return int(((self._planes @ vector) > 0) @ self._bits)
+
+    def _probes(self, code: int) -> list[int]:
+        # Near-duplicates can land one hyperplane over, so check those too
+        return [code, *(code ^ int(bit) for bit in self._bits)]
@@ -0,0 +1,100 @@
+import numpy as np
+import pytest
+
+from ai_ethics_assistant.services import semantic_cache
+from ai_ethics_assistant.services.semantic_cache import SemanticCache
+
+DIM = 32
+
+
+def _unit(vector: np.ndarray) -> np.ndarray:
+    return (vector / np.linalg.norm(vector)).astype(np.float32)
+
+
+def _near(vector: np.ndarray, similarity: float, seed: int = 1) -> np.ndarray:
+    """Unit vector at exactly the given cosine similarity to `vector`"""
+    noise = np.random.default_rng(seed).standard_normal(DIM)
+    orthogonal = _unit(noise - (noise @ vector) * vector)
+    return _unit(similarity * vector + np.sqrt(1 - similarity**2) * orthogonal)
+
+
+@pytest.fixture
+def query():
+    return _unit(np.random.default_rng(0).standard_normal(DIM))
+
+
+def test_exact_query_hits(query):
+    cache = SemanticCache(DIM)
+    cache.put(query, 5, {"context": "a"})
+
+    assert cache.get(query, 5) == {"context": "a"}
+
+
+def test_similarity_threshold(query):
+    cache = SemanticCache(DIM, threshold=0.95, num_planes=1)
+    cache.put(query, 5, {"context": "a"})
+
+    # One plane with its neighbour probed means every entry is a candidate,
+    # so only the cosine threshold decides
+    assert cache.get(_near(query, 0.97), 5) == {"context": "a"}
+    assert cache.get(_near(query, 0.90), 5) is None
+
+
+def test_returns_most_similar_entry(query):
+    cache = SemanticCache(DIM, threshold=0.9, num_planes=1)
+    cache.put(_near(query, 0.92, seed=1), 5, {"context": "far"})
+    cache.put(_near(query, 0.99, seed=2), 5, {"context": "close"})
+
+    assert cache.get(query, 5) == {"context": "close"}
+
+
+def test_top_k_is_part_of_the_key(query):
+    cache = SemanticCache(DIM)
+    cache.put(query, 5, {"context": "a"})
+
+    assert cache.get(query, 3) is None
+
+
+def test_lsh_only_scans_nearby_buckets(query):
+    cache = SemanticCache(DIM, threshold=-1.0, num_planes=8)
+    cache.put(query, 5, {"context": "a"})
+
+    # The opposite vector flips every hyperplane bit, so it is never probed
+    # even though the threshold would accept any similarity
+    assert cache.get(-query, 5) is None
+    assert cache.get(query, 5) == {"context": "a"}
+
+
+def test_evicts_least_recently_used(query):
+    other = _unit(np.random.default_rng(7).standard_normal(DIM))
+    third = _unit(np.random.default_rng(8).standard_normal(DIM))
+    cache = SemanticCache(DIM, maxsize=2)
+    cache.put(query, 5, {"context": "a"})
+    cache.put(other, 5, {"context": "b"})
+    cache.get(query, 5)
+    cache.put(third, 5, {"context": "c"})
+
+    assert cache.get(query, 5) == {"context": "a"}
+    assert cache.get(other, 5) is None
+    assert cache.get(third, 5) == {"context": "c"}
+
+
+def test_entries_expire_after_ttl(query, monkeypatch):
+    now = 1000.0
+    monkeypatch.setattr(semantic_cache.time, "monotonic", lambda: now)
+    cache = SemanticCache(DIM, ttl=60)
+    cache.put(query, 5, {"context": "a"})
+
+    now += 59
+    assert cache.get(query, 5) == {"context": "a"}
+    now += 2
+    assert cache.get(query, 5) is None
+    assert not cache._entries and not cache._buckets
+
+
+def test_clear(query):
+    cache = SemanticCache(DIM)
+    cache.put(query, 5, {"context": "a"})
+    cache.clear()
+
+    assert cache.get(query, 5) is None